@@ -1,8 +1,15 @@
+from typing import List
 from langgraph.graph import StateGraph, END
 from .state import RedteamAgentState
 from .tools.recon import run_subfinder, run_dnsx
 from .tools.scanning import run_naabu, run_nmap
 from .tools.vuln_scan import run_httpx, run_nuclei
+from .work_queue import dispatch_tasks
+
+def _append_errors(state: RedteamAgentState, errors: List[str]) -> str:
+    """Adds a stage's errors to any error already recorded by earlier stages."""
+    previous = [state["error"]] if state.get("error") else []
+    return "; ".join(previous + errors)
 
 def subfinder_node(state: RedteamAgentState):
     """Runs subfinder to discover subdomains."""
@@ -26,6 +33,26 @@ def naabu_node(state: RedteamAgentState):
         print("--- Starting Port Scan ---")
     resolved_domains = state.get("resolved_domains")
     naabu_ports = state.get("naabu_ports")
+    queue_path = state.get("queue_path")
+    if queue_path:
+        # One task per chunk of hosts, scanned concurrently by run_naabu; workers return JSON lines plus per-host errors
+        hosts = [d["host"] for d in resolved_domains or []]
+        chunk_size = max(1, state["naabu_chunk_size"])
+        payloads = [
+            {"hosts": hosts[i:i + chunk_size], "ports": naabu_ports}
+            for i in range(0, len(hosts), chunk_size)
+        ]
+        try:
+            chunks, failures = dispatch_tasks(queue_path, "naabu", payloads, timeout_seconds=state.get("queue_timeout"), verbose=state.get("verbose", 0))
+        except TimeoutError as e:
+            print(f"[!] {e}")
+            return {"scan_results": {"open_ports": []}, "error": _append_errors(state, [str(e)])}
+        open_ports = [line for chunk in chunks for line in chunk["open_ports"]]
+        errors = [error for chunk in chunks for error in chunk["errors"]]
+        errors += [f"naabu task {f['id']} failed for hosts {', '.join(f['payload']['hosts'])}: {f['error']}" for f in failures]
+        if errors:
+            return {"scan_results": {"open_ports": open_ports}, "error": _append_errors(state, errors)}
+        return {"scan_results": {"open_ports": open_ports}}
     open_ports = run_naabu(resolved_domains, ports=naabu_ports, verbose=state.get("verbose", 0))
     return {"scan_results": {"open_ports": open_ports}}
 
@@ -57,6 +84,25 @@ def nuclei_node(state: RedteamAgentState):
         return {"vulnerabilities": []}
     web_servers = state.get("scan_results", {}).get("web_servers", [])
     timeout_seconds = state.get("nuclei_timeout")
+    queue_path = state.get("queue_path")
+    if queue_path:
+        # One task per chunk of URLs; workers return findings plus any nuclei exit error
+        chunk_size = max(1, state["nuclei_chunk_size"])
+        payloads = [
+            {"urls": web_servers[i:i + chunk_size], "timeout_seconds": timeout_seconds}
+            for i in range(0, len(web_servers), chunk_size)
+        ]
+        try:
+            chunks, failures = dispatch_tasks(queue_path, "nuclei", payloads, timeout_seconds=state.get("queue_timeout"), verbose=state.get("verbose", 0))
+        except TimeoutError as e:
+            print(f"[!] {e}")
+            return {"vulnerabilities": [], "error": _append_errors(state, [str(e)])}
+        vulnerabilities = [v for chunk in chunks for v in chunk["vulnerabilities"]]
+        errors = [error for chunk in chunks for error in chunk["errors"]]
+        errors += [f"nuclei task {f['id']} failed for URLs {', '.join(f['payload']['urls'])}: {f['error']}" for f in failures]
+        if errors:
+            return {"vulnerabilities": vulnerabilities, "error": _append_errors(state, errors)}
+        return {"vulnerabilities": vulnerabilities}
     vulnerabilities = run_nuclei(web_servers, timeout_seconds=timeout_seconds, verbose=state.get("verbose", 0))
     return {"vulnerabilities": vulnerabilities}
 
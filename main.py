@@ -2,6 +2,7 @@ import argparse
 import json
 from .graph import create_graph
 from .report_generator import generate_html_report
+from .work_queue import HEARTBEAT_SECONDS
 
 def main():
     """Main function to run the Red Team agent."""
@@ -13,9 +14,20 @@ def main():
                         help="Enable nuclei vulnerability scanning stage.")
     parser.add_argument("--nuclei-timeout", dest="nuclei_timeout", type=int, default=5,
                         help="Per-request timeout (seconds) for nuclei. If omitted, nuclei default is used.")
+    parser.add_argument("--queue", dest="queue_path", default=None,
+                        help="Coordinator mode: dispatch naabu/nuclei tasks to workers via this SQLite queue file.")
+    parser.add_argument("--naabu-chunk-size", dest="naabu_chunk_size", type=int, default=32,
+                        help="Hosts per naabu task in coordinator mode; each worker scans a chunk's hosts concurrently.")
+    parser.add_argument("--nuclei-chunk-size", dest="nuclei_chunk_size", type=int, default=25,
+                        help="URLs per nuclei task in coordinator mode.")
+    parser.add_argument("--queue-timeout", dest="queue_timeout", type=int, default=600,
+                        help=f"Coordinator mode: give up on a stage after this many seconds without worker progress (0 waits forever). "
+                             f"Running workers report progress every {HEARTBEAT_SECONDS}s regardless of --lease, so this must be at least {2 * HEARTBEAT_SECONDS}.")
     parser.add_argument("-v", dest="verbose", action="count", default=0,
                         help="Increase verbosity (-v, -vv, -vvv).")
     args = parser.parse_args()
+    if args.queue_timeout and args.queue_timeout < 2 * HEARTBEAT_SECONDS:
+        parser.error(f"--queue-timeout must be 0 or at least {2 * HEARTBEAT_SECONDS} seconds")
 
     app = create_graph()
 
@@ -31,6 +43,10 @@ def main():
         "enable_nuclei": args.enable_nuclei,
         "nuclei_timeout": args.nuclei_timeout,
         "verbose": args.verbose,
+        "queue_path": args.queue_path,
+        "naabu_chunk_size": args.naabu_chunk_size,
+        "nuclei_chunk_size": args.nuclei_chunk_size,
+        "queue_timeout": args.queue_timeout,
     }
 
     print(f"--- Initializing Agent for target: {args.domain} ---")
@@ -1,4 +1,5 @@
 import json
+from html import escape
 from typing import Dict, Any
 
 def generate_html_report(state: Dict[str, Any], domain: str) -> str:
@@ -11,6 +12,7 @@ def generate_html_report(state: Dict[str, Any], domain: str) -> str:
     open_ports_raw = scan_results.get("open_ports", [])
     web_servers = scan_results.get("web_servers", [])
     vulnerabilities = state.get("vulnerabilities", [])
+    error = state.get("error")
 
     # Process open ports for better display (group by host)
     # Normalize ports to integers when possible for consistent sorting and checks
@@ -86,6 +88,7 @@ def generate_html_report(state: Dict[str, Any], domain: str) -> str:
                 <p><strong>Live Hosts Found:</strong> {len(resolved_domains)}</p>
                 <p><strong>Web Servers Found:</strong> {len(web_servers)}</p>
                 <p><strong>Vulnerabilities Found:</strong> {len(vulnerabilities)}</p>
+                {f'<p><strong>Incomplete Scan:</strong> {escape(error)}</p>' if error else ''}
             </div>
 
             <h2>1. Discovered Subdomains</h2>
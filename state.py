@@ -15,3 +15,7 @@ class RedteamAgentState(TypedDict):
     enable_nuclei: bool
     nuclei_timeout: Optional[int]
     verbose: int
+    queue_path: Optional[str] # SQLite work queue; set to dispatch naabu/nuclei to workers
+    naabu_chunk_size: int
+    nuclei_chunk_size: int
+    queue_timeout: Optional[int] # seconds without queue progress before giving up
@@ -0,0 +1,11 @@
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+# The modules use package-relative imports; expose the checkout as 'redteam_agent'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "redteam_agent" not in sys.modules:
+    spec = importlib.machinery.ModuleSpec("redteam_agent", None, is_package=True)
+    spec.submodule_search_locations = [ROOT]
+    sys.modules["redteam_agent"] = importlib.util.module_from_spec(spec)
@@ -0,0 +1,108 @@
+import pytest
+
+from redteam_agent import graph
+
+
+def make_state(**overrides):
+    state = {
+        "resolved_domains": [{"host": h} for h in ["a", "b", "c", "d", "e"]],
+        "scan_results": {"web_servers": [f"http://{h}" for h in ["a", "b", "c"]]},
+        "error": None,
+        "naabu_ports": "80,443",
+        "enable_nuclei": True,
+        "nuclei_timeout": 5,
+        "verbose": 0,
+        "queue_path": "queue.db",
+        "naabu_chunk_size": 2,
+        "nuclei_chunk_size": 2,
+        "queue_timeout": 600,
+    }
+    state.update(overrides)
+    return state
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Stubs dispatch_tasks; tests set 'response' and read back the submitted payloads."""
+    calls = {"response": ([], [])}
+
+    def fake_dispatch(queue_path, kind, payloads, timeout_seconds=None, verbose=0):
+        calls.update(kind=kind, payloads=payloads, timeout_seconds=timeout_seconds)
+        if isinstance(calls["response"], Exception):
+            raise calls["response"]
+        return calls["response"]
+
+    monkeypatch.setattr(graph, "dispatch_tasks", fake_dispatch)
+    return calls
+
+
+def test_naabu_node_chunks_hosts(dispatched):
+    graph.naabu_node(make_state())
+    assert dispatched["kind"] == "naabu"
+    assert dispatched["timeout_seconds"] == 600
+    assert dispatched["payloads"] == [
+        {"hosts": ["a", "b"], "ports": "80,443"},
+        {"hosts": ["c", "d"], "ports": "80,443"},
+        {"hosts": ["e"], "ports": "80,443"},
+    ]
+
+
+def test_naabu_node_clamps_chunk_size(dispatched):
+    graph.naabu_node(make_state(naabu_chunk_size=0))
+    assert [p["hosts"] for p in dispatched["payloads"]] == [["a"], ["b"], ["c"], ["d"], ["e"]]
+
+
+def test_naabu_node_merges_chunks_and_errors(dispatched):
+    dispatched["response"] = (
+        [{"open_ports": ["a:80", "b:80"], "errors": []}, {"open_ports": ["c:443"], "errors": ["[naabu][d] exited code 1"]}],
+        [{"id": 3, "payload": {"hosts": ["e"], "ports": "80,443"}, "error": "lease expired"}],
+    )
+    update = graph.naabu_node(make_state(error="dnsx warning"))
+    assert update["scan_results"] == {"open_ports": ["a:80", "b:80", "c:443"]}
+    assert update["error"] == (
+        "dnsx warning; [naabu][d] exited code 1; "
+        "naabu task 3 failed for hosts e: lease expired"
+    )
+
+
+def test_naabu_node_without_errors_leaves_error_unset(dispatched):
+    dispatched["response"] = ([{"open_ports": ["a:80"], "errors": []}], [])
+    assert graph.naabu_node(make_state()) == {"scan_results": {"open_ports": ["a:80"]}}
+
+
+def test_naabu_node_records_timeout(dispatched):
+    dispatched["response"] = TimeoutError("no progress on 'naabu' tasks")
+    update = graph.naabu_node(make_state())
+    assert update == {"scan_results": {"open_ports": []}, "error": "no progress on 'naabu' tasks"}
+
+
+def test_nuclei_node_chunks_urls(dispatched):
+    graph.nuclei_node(make_state(nuclei_chunk_size=0))
+    assert dispatched["kind"] == "nuclei"
+    assert dispatched["payloads"] == [
+        {"urls": ["http://a"], "timeout_seconds": 5},
+        {"urls": ["http://b"], "timeout_seconds": 5},
+        {"urls": ["http://c"], "timeout_seconds": 5},
+    ]
+
+
+def test_nuclei_node_merges_chunks_and_errors(dispatched):
+    finding = {"template-id": "t", "info": {"severity": "low"}}
+    dispatched["response"] = (
+        [{"vulnerabilities": [finding], "errors": ["[nuclei] exited with code 2"]}],
+        [{"id": 7, "payload": {"urls": ["http://c"], "timeout_seconds": 5}, "error": "boom"}],
+    )
+    update = graph.nuclei_node(make_state())
+    assert update["vulnerabilities"] == [finding]
+    assert update["error"] == "[nuclei] exited with code 2; nuclei task 7 failed for URLs http://c: boom"
+
+
+def test_nuclei_node_records_timeout(dispatched):
+    dispatched["response"] = TimeoutError("no progress on 'nuclei' tasks")
+    update = graph.nuclei_node(make_state(error="earlier"))
+    assert update == {"vulnerabilities": [], "error": "earlier; no progress on 'nuclei' tasks"}
+
+
+def test_nuclei_node_disabled_skips_queue(dispatched):
+    assert graph.nuclei_node(make_state(enable_nuclei=False)) == {"vulnerabilities": []}
+    assert "kind" not in dispatched
@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+
+from redteam_agent import worker
+from redteam_agent.tools import scanning, vuln_scan
+
+
+class FakeCompleted:
+    def __init__(self, stdout="", stderr="", returncode=0):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = returncode
+
+
+def fake_naabu_run(failing_hosts):
+    def run(cmd, **kwargs):
+        host = cmd[cmd.index("-host") + 1]
+        line = json.dumps({"host": host, "port": 80})
+        if host in failing_hosts:
+            # naabu can exit non-zero after printing some results
+            return FakeCompleted(stdout=line, stderr="boom", returncode=1)
+        return FakeCompleted(stdout=line)
+    return run
+
+
+class FakePopen:
+    def __init__(self, lines, returncode):
+        self.stdin = io.StringIO()
+        self.stdout = iter(lines)
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+
+def domains(*hosts):
+    return [{"host": h} for h in hosts]
+
+
+def test_naabu_keeps_other_hosts_when_one_fails(monkeypatch):
+    monkeypatch.setattr(scanning.subprocess, "run", fake_naabu_run({"b"}))
+    errors = []
+    lines = scanning.run_naabu(domains("a", "b", "c", "d"), raise_errors=True, errors=errors)
+    assert sorted(json.loads(l)["host"] for l in lines) == ["a", "b", "c", "d"]
+    assert len(errors) == 1 and "[naabu][b] exited code 1" in errors[0]
+
+
+def test_naabu_raises_when_every_host_fails(monkeypatch):
+    monkeypatch.setattr(scanning.subprocess, "run", fake_naabu_run({"a", "b"}))
+    with pytest.raises(RuntimeError, match="all 2 hosts"):
+        scanning.run_naabu(domains("a", "b"), raise_errors=True)
+
+
+def test_naabu_local_mode_never_raises(monkeypatch):
+    monkeypatch.setattr(scanning.subprocess, "run", fake_naabu_run({"a", "b"}))
+    assert len(scanning.run_naabu(domains("a", "b"))) == 2
+
+
+def test_naabu_missing_binary_raises_only_with_raise_errors(monkeypatch):
+    def missing(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+    monkeypatch.setattr(scanning.subprocess, "run", missing)
+    assert scanning.run_naabu(domains("a")) == []
+    with pytest.raises(FileNotFoundError):
+        scanning.run_naabu(domains("a"), raise_errors=True)
+
+
+def test_nuclei_keeps_findings_on_non_zero_exit(monkeypatch):
+    finding = {"template-id": "t", "matched-at": "http://a", "info": {"severity": "high"}}
+    monkeypatch.setattr(vuln_scan.subprocess, "Popen",
+                        lambda *a, **k: FakePopen([json.dumps(finding) + "\n", "log line\n"], returncode=2))
+    errors = []
+    assert vuln_scan.run_nuclei(["http://a"], raise_errors=True, errors=errors) == [finding]
+    assert errors == ["[nuclei] exited with code 2"]
+
+
+def test_nuclei_missing_binary_raises_only_with_raise_errors(monkeypatch):
+    def missing(*args, **kwargs):
+        raise FileNotFoundError("nuclei")
+    monkeypatch.setattr(vuln_scan.subprocess, "Popen", missing)
+    assert vuln_scan.run_nuclei(["http://a"]) == []
+    with pytest.raises(FileNotFoundError):
+        vuln_scan.run_nuclei(["http://a"], raise_errors=True)
+
+
+def test_naabu_task_returns_partial_results_and_errors(monkeypatch):
+    monkeypatch.setattr(worker.shutil, "which", lambda name: "/usr/bin/" + name)
+    monkeypatch.setattr(scanning.subprocess, "run", fake_naabu_run({"b"}))
+    result = worker.run_naabu_task({"hosts": ["a", "b"], "ports": None})
+    assert len(result["open_ports"]) == 2
+    assert len(result["errors"]) == 1
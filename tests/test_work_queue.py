@@ -0,0 +1,200 @@
+import contextlib
+import threading
+import time
+
+import pytest
+
+from redteam_agent import worker
+from redteam_agent.work_queue import WorkQueue, dispatch_tasks
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "queue.db")
+
+
+@pytest.fixture
+def queue(queue_path):
+    q = WorkQueue(queue_path, max_attempts=2)
+    yield q
+    q.close()
+
+
+@contextlib.contextmanager
+def running_workers(queue_path, count=1):
+    """Runs 'count' worker loops in threads for the duration of the block."""
+    stop = threading.Event()
+
+    def run(worker_id):
+        q = WorkQueue(queue_path)
+        while not stop.is_set():
+            task = q.claim(worker_id)
+            if task is None:
+                time.sleep(0.01)
+                continue
+            worker.process_task(q, task, worker_id)
+        q.close()
+
+    threads = [threading.Thread(target=run, args=(f"w{i}",), daemon=True) for i in range(count)]
+    for t in threads:
+        t.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def statuses(queue, batch_id):
+    return [t["status"] for t in queue.batch_results(batch_id)]
+
+
+def test_claim_and_complete(queue):
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("w1")
+    assert task["batch_id"] == batch_id
+    assert task["payload"] == {"hosts": ["a"]}
+    assert task["attempts"] == 1
+    assert queue.claim("w2") is None
+
+    assert queue.complete(task["id"], "w1", ["line"])
+    results = queue.batch_results(batch_id)
+    assert results[0]["status"] == "done"
+    assert results[0]["result"] == ["line"]
+
+
+def test_complete_requires_lease_holder(queue):
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("w1")
+    assert not queue.complete(task["id"], "w2", ["stale"])
+    assert statuses(queue, batch_id) == ["leased"]
+
+
+def test_fail_retries_until_max_attempts(queue):
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("w1")
+    queue.fail(task["id"], "w1", "boom")
+    assert statuses(queue, batch_id) == ["pending"]
+
+    retry = queue.claim("w2")
+    assert retry["id"] == task["id"]
+    assert retry["attempts"] == 2
+    queue.fail(retry["id"], "w2", "boom again")
+    results = queue.batch_results(batch_id)
+    assert results[0]["status"] == "failed"
+    assert results[0]["error"] == "boom again"
+    assert queue.claim("w3") is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("dead", lease_seconds=0)
+    time.sleep(0.01)
+
+    reclaimed = queue.claim("alive")
+    assert reclaimed["id"] == task["id"]
+    assert reclaimed["attempts"] == 2
+    assert not queue.renew(task["id"], "dead")
+    assert not queue.complete(task["id"], "dead", ["late"])
+    assert queue.complete(task["id"], "alive", ["fresh"])
+    assert queue.batch_results(batch_id)[0]["result"] == ["fresh"]
+
+
+def test_expire_leases_fails_exhausted_tasks(queue_path):
+    q = WorkQueue(queue_path, max_attempts=1)
+    batch_id = q.submit("naabu", [{"hosts": ["a"]}])
+    q.claim("dead", lease_seconds=0)
+    time.sleep(0.01)
+    q.expire_leases()
+    assert statuses(q, batch_id) == ["failed"]
+    q.close()
+
+
+def test_cancel_batch_hides_tasks_from_workers(queue):
+    batch_id = queue.submit("nuclei", [{"urls": ["a"]}, {"urls": ["b"]}])
+    task = queue.claim("w1")
+    assert queue.cancel_batch(batch_id) == 2
+    assert statuses(queue, batch_id) == ["cancelled", "cancelled"]
+    assert queue.claim("w2") is None
+    assert not queue.complete(task["id"], "w1", [])
+
+
+def test_dispatch_tasks_returns_results_in_submission_order(queue_path, monkeypatch):
+    def fake_naabu(payload, verbose=0):
+        # Finish later tasks first so completion order differs from submission order
+        time.sleep(0.05 * (3 - len(payload["hosts"][0])))
+        return [f"{h}:80" for h in payload["hosts"]]
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, "naabu", fake_naabu)
+    payloads = [{"hosts": ["a"]}, {"hosts": ["bb"]}, {"hosts": ["ccc"]}]
+    with running_workers(queue_path, count=3):
+        results, failures = dispatch_tasks(queue_path, "naabu", payloads, timeout_seconds=10, poll_interval=0.01)
+    assert results == [["a:80"], ["bb:80"], ["ccc:80"]]
+    assert failures == []
+
+
+def test_dispatch_tasks_returns_failed_tasks(queue_path, monkeypatch):
+    def fake_naabu(payload, verbose=0):
+        if payload["hosts"] == ["bad"]:
+            raise RuntimeError("no route")
+        return []
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, "naabu", fake_naabu)
+    with running_workers(queue_path):
+        results, failures = dispatch_tasks(queue_path, "naabu", [{"hosts": ["ok"]}, {"hosts": ["bad"]}],
+                                           timeout_seconds=10, poll_interval=0.01)
+    assert results == [[]]
+    assert len(failures) == 1
+    assert failures[0]["payload"] == {"hosts": ["bad"]}
+    assert failures[0]["error"] == "no route"
+
+
+def test_dispatch_tasks_times_out_and_cancels_without_workers(queue_path):
+    with pytest.raises(TimeoutError):
+        dispatch_tasks(queue_path, "nuclei", [{"urls": ["a"]}], timeout_seconds=0.1, poll_interval=0.02)
+    q = WorkQueue(queue_path)
+    assert q.conn.execute("SELECT status FROM tasks").fetchall() == [("cancelled",)]
+    assert q.claim("late") is None
+    q.close()
+
+
+def test_worker_fails_task_when_tool_is_missing(queue, monkeypatch):
+    monkeypatch.setattr(worker.shutil, "which", lambda name: None)
+    batch_id = queue.submit("nuclei", [{"urls": ["http://a"]}])
+    task = queue.claim("w1")
+    worker.process_task(queue, task, "w1")
+    results = queue.batch_results(batch_id)
+    assert results[0]["status"] == "pending"
+    assert "'nuclei' command not found" in results[0]["error"]
+
+
+def test_heartbeat_refreshes_progress_with_long_lease(queue, monkeypatch):
+    monkeypatch.setattr(worker, "HEARTBEAT_SECONDS", 0.02)
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("w1", lease_seconds=2000)
+    claimed_at = queue.batch_last_update(batch_id)
+    seen = []
+
+    def slow_naabu(payload, verbose=0):
+        time.sleep(0.2)
+        seen.append(queue.batch_last_update(batch_id))
+        return []
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, "naabu", slow_naabu)
+    worker.process_task(queue, task, "w1", lease_seconds=2000)
+    assert seen[0] > claimed_at
+    assert statuses(queue, batch_id) == ["done"]
+
+
+def test_interrupted_worker_releases_task_without_using_an_attempt(queue, monkeypatch):
+    def interrupted(payload, verbose=0):
+        raise KeyboardInterrupt
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, "naabu", interrupted)
+    batch_id = queue.submit("naabu", [{"hosts": ["a"]}])
+    task = queue.claim("w1")
+    with pytest.raises(KeyboardInterrupt):
+        worker.process_task(queue, task, "w1")
+    assert statuses(queue, batch_id) == ["pending"]
+    assert queue.claim("w2")["attempts"] == 1
@@ -1,16 +1,19 @@
 import subprocess
 import json
 import re
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = None, verbose: int = 0) -> List[str]:
+def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = None, verbose: int = 0,
+              raise_errors: bool = False, errors: Optional[List[str]] = None) -> List[str]:
     """Runs naabu to find open ports with per-host progress (counts zero-open hosts).
 
     - Default: use '-top-ports 100'
     - If 'ports' provided: use '-ports <ports>' (supports '1-1024', '80,443', ...)
     - Scans per host concurrently and updates progress on host completion
+    - A failing host is skipped; its message is appended to 'errors' when a list is given
+    - If 'raise_errors' is set, a missing binary or every host failing raises instead
     """
     if not resolved_domains:
         return []
@@ -31,8 +34,9 @@ def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = Non
             print(f"[naabu] hosts={total_hosts}")
         open_ports: List[str] = []
         hosts_with_findings: Set[str] = set()
+        host_errors: List[str] = []
 
-        def scan_single_host(host: str) -> List[str]:
+        def scan_single_host(host: str) -> Tuple[List[str], Optional[str]]:
             cmd = base_cmd + ["-host", host]
             result = subprocess.run(cmd, capture_output=True, text=True, check=False)
             host_lines: List[str] = []
@@ -48,9 +52,11 @@ def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = Non
                     except json.JSONDecodeError:
                         if verbose >= 3:
                             print(f"[naabu][{host}] {line}")
+            error = None
             if result.returncode != 0:
-                print(f"[naabu][{host}] exited code {result.returncode}. stderr={(result.stderr or '').strip()}")
-            return host_lines
+                error = f"[naabu][{host}] exited code {result.returncode}. stderr={(result.stderr or '').strip()}"
+                print(error)
+            return host_lines, error
 
         max_workers = min(32, total_hosts or 1)
         pbar = tqdm(total=total_hosts, desc="naabu hosts", unit="host") if total_hosts > 0 else None
@@ -59,11 +65,17 @@ def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = Non
             for future in as_completed(future_to_host):
                 h = future_to_host[future]
                 try:
-                    lines = future.result()
+                    lines, error = future.result()
+                except FileNotFoundError:
+                    if raise_errors:
+                        raise
+                    lines, error = [], f"[naabu][{h}] error: 'naabu' command not found"
                 except Exception as e:
+                    lines, error = [], f"[naabu][{h}] error: {e}"
                     if verbose >= 3:
-                        print(f"[naabu][{h}] error: {e}")
-                    lines = []
+                        print(error)
+                if error:
+                    host_errors.append(error)
                 if lines:
                     hosts_with_findings.add(h)
                     open_ports.extend(lines)
@@ -72,11 +84,18 @@ def run_naabu(resolved_domains: List[Dict[str, Any]], ports: Optional[str] = Non
         if pbar is not None:
             pbar.close()
 
+        if errors is not None:
+            errors.extend(host_errors)
+        if raise_errors and len(host_errors) == total_hosts:
+            raise RuntimeError(f"naabu failed on all {total_hosts} hosts; first error: {host_errors[0]}")
+
         if verbose >= 1:
             print(f"[naabu] hosts with findings: {len(hosts_with_findings)}/{total_hosts}; zero-open: {total_hosts - len(hosts_with_findings)}")
             print(f"[+] Found {len(open_ports)} open ports.")
         return open_ports
     except FileNotFoundError:
+        if raise_errors:
+            raise
         print("[!] Error: 'naabu' command not found. Please ensure it is installed and in your PATH.")
         return []
     except subprocess.CalledProcessError as e:
@@ -37,12 +37,14 @@ def run_httpx(resolved_domains: List[Dict[str, Any]], verbose: int = 0) -> List[
             print(f"[httpx] {e}")
         return []
 
-def run_nuclei(urls: List[str], timeout_seconds: Optional[int] = None, verbose: int = 0) -> List[Dict[str, Any]]:
+def run_nuclei(urls: List[str], timeout_seconds: Optional[int] = None, verbose: int = 0,
+               raise_errors: bool = False, errors: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Runs nuclei to find vulnerabilities.
 
     Uses a temporary file with '-list', suppresses noisy output, parses
     JSON lines from stdout even on non-zero exit, and excludes some
-    noisy templates via '-eid'.
+    noisy templates via '-eid'. A non-zero exit is appended to 'errors'
+    when a list is given; with 'raise_errors', a missing binary raises.
     """
     if not urls:
         return []
@@ -149,6 +151,8 @@ def run_nuclei(urls: List[str], timeout_seconds: Optional[int] = None, verbose:
         returncode = process.wait()
         if stats_pbar is not None:
             stats_pbar.close()
+        if returncode != 0 and errors is not None:
+            errors.append(f"[nuclei] exited with code {returncode}")
         if returncode != 0 and verbose >= 1:
             print(f"[!] nuclei exited with code {returncode}")
 
@@ -156,6 +160,8 @@ def run_nuclei(urls: List[str], timeout_seconds: Optional[int] = None, verbose:
             print(f"[+] Found {len(vulnerabilities)} potential vulnerabilities.")
         return vulnerabilities
     except FileNotFoundError:
+        if raise_errors:
+            raise
         print("[!] Error: 'nuclei' command not found. Please ensure it is installed and in your PATH.")
         return []
     finally:
@@ -0,0 +1,259 @@
+import json
+import sqlite3
+import time
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
+from tqdm import tqdm
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+# Workers renew leases at least this often, whatever the lease length, so a
+# coordinator's no-progress timeout only needs to exceed this interval
+HEARTBEAT_SECONDS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_tasks_batch ON tasks (batch_id);
+"""
+
+class WorkQueue:
+    """Durable task queue backed by a SQLite file.
+
+    The coordinator submits batches of tasks; workers claim them with a
+    time-limited lease, renew it while running and push results back.
+    A task whose lease expires (e.g. the worker died) becomes claimable
+    again until it has been attempted 'max_attempts' times.
+    """
+
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        # Autocommit mode; write transactions are opened explicitly below
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA busy_timeout = 30000")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def submit(self, kind: str, payloads: List[Dict[str, Any]]) -> str:
+        """Enqueues one task per payload under a new batch id and returns it."""
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        rows = [(batch_id, kind, json.dumps(p), now, now) for p in payloads]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                "INSERT INTO tasks (batch_id, kind, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return batch_id
+
+    def claim(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Leases the oldest pending (or lease-expired) task, or returns None."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._fail_exhausted_leases(now)
+            row = self.conn.execute(
+                "SELECT id, batch_id, kind, payload, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            task_id, batch_id, kind, payload, attempts = row
+            self.conn.execute(
+                "UPDATE tasks SET status = 'leased', worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, task_id),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return {
+            "id": task_id,
+            "batch_id": batch_id,
+            "kind": kind,
+            "payload": json.loads(payload),
+            "attempts": attempts + 1,
+        }
+
+    def _fail_exhausted_leases(self, now: float) -> None:
+        # Expired leases that already used up their attempts are given up on
+        self.conn.execute(
+            "UPDATE tasks SET status = 'failed', error = 'lease expired', updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+
+    def expire_leases(self) -> None:
+        """Marks lease-expired tasks with no attempts left as failed."""
+        self._fail_exhausted_leases(time.time())
+
+    def renew(self, task_id: int, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extends a lease still held by 'worker_id'. Returns False if it was lost."""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+            (now + lease_seconds, now, task_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: Any) -> bool:
+        """Stores a task result. Ignored (returns False) if 'worker_id' no longer holds the lease."""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+            (json.dumps(result), now, task_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """Records an error; the task is retried until 'max_attempts' is reached."""
+        now = time.time()
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+            (self.max_attempts, error, now, task_id, worker_id),
+        )
+
+    def release(self, task_id: int, worker_id: str) -> bool:
+        """Hands a leased task back as pending without counting the attempt (e.g. worker shutdown)."""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'pending', worker_id = NULL, lease_expires = NULL, "
+            "attempts = MAX(attempts - 1, 0), updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'leased'",
+            (now, task_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def cancel_batch(self, batch_id: str) -> int:
+        """Cancels the unfinished tasks of a batch so workers skip them. Returns the count."""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'cancelled', lease_expires = NULL, updated_at = ? "
+            "WHERE batch_id = ? AND status IN ('pending', 'leased')",
+            (now, batch_id),
+        )
+        return cur.rowcount
+
+    def batch_last_update(self, batch_id: str) -> float:
+        """Returns the latest claim/renew/finish timestamp across a batch."""
+        row = self.conn.execute(
+            "SELECT MAX(updated_at) FROM tasks WHERE batch_id = ?",
+            (batch_id,),
+        ).fetchone()
+        return row[0] or 0.0
+
+    def batch_progress(self, batch_id: str) -> Dict[str, int]:
+        """Returns task counts per status for a batch."""
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE batch_id = ? GROUP BY status",
+            (batch_id,),
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    def batch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Returns every task of a batch in submission order."""
+        rows = self.conn.execute(
+            "SELECT id, status, payload, result, error FROM tasks WHERE batch_id = ? ORDER BY id",
+            (batch_id,),
+        ).fetchall()
+        return [
+            {
+                "id": task_id,
+                "status": status,
+                "payload": json.loads(payload),
+                "result": json.loads(result) if result is not None else None,
+                "error": error,
+            }
+            for task_id, status, payload, result, error in rows
+        ]
+
+def dispatch_tasks(queue_path: str, kind: str, payloads: List[Dict[str, Any]],
+                   timeout_seconds: Optional[float] = None, poll_interval: float = 1.0,
+                   verbose: int = 0) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """Coordinator side: submits tasks and blocks until workers finish them.
+
+    Returns the results of finished tasks in submission order, and the
+    tasks that exhausted their attempts (id, payload and last error) so
+    the caller can record what is missing from the scan. If no
+    task is claimed, renewed or finished for 'timeout_seconds', raises
+    TimeoutError. On any early exit the batch's unfinished tasks are
+    cancelled so later runs' workers do not pick them up.
+    """
+    if not payloads:
+        return [], []
+
+    queue = WorkQueue(queue_path)
+    batch_id: Optional[str] = None
+    completed = False
+    try:
+        batch_id = queue.submit(kind, payloads)
+        total = len(payloads)
+        if verbose >= 1:
+            print(f"[queue] submitted {total} '{kind}' tasks to {queue_path} (batch {batch_id})")
+            print("[queue] waiting for workers to claim tasks...")
+        pbar = tqdm(total=total, desc=f"{kind} tasks", unit="task")
+        finished = 0
+        try:
+            while finished < total:
+                queue.expire_leases()
+                progress = queue.batch_progress(batch_id)
+                now_finished = progress.get("done", 0) + progress.get("failed", 0)
+                if now_finished > finished:
+                    pbar.update(now_finished - finished)
+                    finished = now_finished
+                if finished >= total:
+                    break
+                if timeout_seconds and time.time() - queue.batch_last_update(batch_id) > timeout_seconds:
+                    raise TimeoutError(
+                        f"no progress on '{kind}' tasks for {timeout_seconds}s "
+                        f"({finished}/{total} finished); are any workers running?"
+                    )
+                time.sleep(poll_interval)
+        finally:
+            pbar.close()
+        completed = True
+
+        results: List[Any] = []
+        failures: List[Dict[str, Any]] = []
+        for task in queue.batch_results(batch_id):
+            if task["status"] == "failed":
+                print(f"[!] {kind} task {task['id']} failed: {task['error']}")
+                failures.append({"id": task["id"], "payload": task["payload"], "error": task["error"]})
+            else:
+                results.append(task["result"])
+        return results, failures
+    finally:
+        if batch_id is not None and not completed:
+            cancelled = queue.cancel_batch(batch_id)
+            if cancelled:
+                print(f"[queue] cancelled {cancelled} unfinished '{kind}' tasks")
+        queue.close()
@@ -0,0 +1,125 @@
+import argparse
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+from .work_queue import WorkQueue, DEFAULT_LEASE_SECONDS, HEARTBEAT_SECONDS
+from .tools.scanning import run_naabu
+from .tools.vuln_scan import run_nuclei
+
+def require_tool(name: str) -> None:
+    """Raises if 'name' is not on this worker's PATH, so the task is retried elsewhere."""
+    if shutil.which(name) is None:
+        raise RuntimeError(f"'{name}' command not found on worker {socket.gethostname()}")
+
+def run_naabu_task(payload: Dict[str, Any], verbose: int = 0) -> Any:
+    """Scans a chunk of hosts concurrently; returns naabu JSON lines and per-host errors."""
+    require_tool("naabu")
+    errors: List[str] = []
+    open_ports = run_naabu([{"host": h} for h in payload["hosts"]], ports=payload.get("ports"), verbose=verbose,
+                           raise_errors=True, errors=errors)
+    return {"open_ports": open_ports, "errors": errors}
+
+def run_nuclei_task(payload: Dict[str, Any], verbose: int = 0) -> Any:
+    """Scans a chunk of URLs; returns nuclei findings and any exit-status error."""
+    require_tool("nuclei")
+    errors: List[str] = []
+    vulnerabilities = run_nuclei(payload["urls"], timeout_seconds=payload.get("timeout_seconds"), verbose=verbose,
+                                 raise_errors=True, errors=errors)
+    return {"vulnerabilities": vulnerabilities, "errors": errors}
+
+TASK_HANDLERS = {
+    "naabu": run_naabu_task,
+    "nuclei": run_nuclei_task,
+}
+
+def process_task(queue: WorkQueue, task: Dict[str, Any], worker_id: str,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS, verbose: int = 0) -> None:
+    """Runs one claimed task, renewing its lease until the tool wrapper returns."""
+    handler = TASK_HANDLERS.get(task["kind"])
+    if handler is None:
+        queue.fail(task["id"], worker_id, f"unknown task kind '{task['kind']}'")
+        return
+
+    stop = threading.Event()
+    interval = min(HEARTBEAT_SECONDS, max(1, lease_seconds // 3))
+
+    def keep_lease() -> None:
+        while not stop.wait(interval):
+            if not queue.renew(task["id"], worker_id, lease_seconds):
+                if verbose >= 1:
+                    print(f"[worker] lost lease on task {task['id']}")
+                return
+
+    heartbeat = threading.Thread(target=keep_lease, daemon=True)
+    heartbeat.start()
+    try:
+        result = handler(task["payload"], verbose=verbose)
+    except KeyboardInterrupt:
+        stop.set()
+        heartbeat.join()
+        if queue.release(task["id"], worker_id):
+            print(f"[*] Released {task['kind']} task {task['id']} back to the queue.")
+        raise
+    except Exception as e:
+        stop.set()
+        heartbeat.join()
+        print(f"[!] {task['kind']} task {task['id']} failed: {e}")
+        queue.fail(task["id"], worker_id, str(e))
+        return
+    stop.set()
+    heartbeat.join()
+    if not queue.complete(task["id"], worker_id, result) and verbose >= 1:
+        print(f"[worker] dropped result of task {task['id']}; lease was lost")
+
+def run_worker(queue_path: str, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+               poll_interval: float = 2.0, exit_when_idle: bool = False, verbose: int = 0) -> None:
+    """Claims and runs tasks from the queue until interrupted (or idle)."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    queue = WorkQueue(queue_path)
+    print(f"--- Worker {worker_id} polling {queue_path} ---")
+    try:
+        while True:
+            task = queue.claim(worker_id, lease_seconds)
+            if task is None:
+                if exit_when_idle:
+                    break
+                time.sleep(poll_interval)
+                continue
+            if verbose >= 1:
+                print(f"[worker] claimed {task['kind']} task {task['id']} (attempt {task['attempts']})")
+            process_task(queue, task, worker_id, lease_seconds=lease_seconds, verbose=verbose)
+    except KeyboardInterrupt:
+        print("[*] Worker interrupted.")
+    finally:
+        queue.close()
+
+def main():
+    """Entry point for a distributed scan worker."""
+    parser = argparse.ArgumentParser(description="Red Team Agent queue worker")
+    parser.add_argument("--queue", dest="queue_path", required=True,
+                        help="Path to the SQLite work queue shared with the coordinator.")
+    parser.add_argument("--lease", dest="lease_seconds", type=int, default=DEFAULT_LEASE_SECONDS,
+                        help=f"Lease length in seconds. While a task runs the lease is renewed every {HEARTBEAT_SECONDS}s "
+                             "(or a third of the lease if shorter), which is what the coordinator's --queue-timeout watches.")
+    parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=2.0,
+                        help="Seconds to wait between polls when the queue is empty.")
+    parser.add_argument("--exit-when-idle", dest="exit_when_idle", action="store_true",
+                        help="Exit once no claimable task is left instead of polling forever.")
+    parser.add_argument("-v", dest="verbose", action="count", default=0,
+                        help="Increase verbosity (-v, -vv, -vvv).")
+    args = parser.parse_args()
+
+    run_worker(
+        args.queue_path,
+        lease_seconds=args.lease_seconds,
+        poll_interval=args.poll_interval,
+        exit_when_idle=args.exit_when_idle,
+        verbose=args.verbose,
+    )
+
+if __name__ == "__main__":
+    main()